@@ -1,25 +1,60 @@
 import sys
 import os
+import asyncio
+import shutil
 import subprocess
 import logging
 import json
+import sqlite3
+import time
+import queue
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QPushButton, QProgressBar,
     QTextEdit, QVBoxLayout, QHBoxLayout, QFileDialog, QMessageBox,
-    QComboBox, QAction, QMenuBar, QLineEdit, QCheckBox,
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QSpacerItem,
-    QSizePolicy
+    QComboBox, QAction, QMenuBar, QLineEdit, QCheckBox, QSpinBox,
+    QTableView, QHeaderView, QAbstractItemView, QSpacerItem,
+    QSizePolicy, QStyledItemDelegate, QStyleOptionProgressBar, QStyle
 )
 from PyQt5.QtCore import (
-    Qt, QObject, pyqtSlot, QProcess, pyqtSignal, QLocale, QTranslator
+    Qt, QObject, pyqtSlot, QProcess, pyqtSignal, QLocale, QTranslator,
+    QElapsedTimer, QAbstractTableModel, QModelIndex, QTimer, QTemporaryFile,
+    QRunnable, QThreadPool
 )
 from PyQt5.QtGui import QIcon
 
-# Configuración del registro
+# Dependencias opcionales para leer la duración desde la cabecera del archivo
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+try:
+    import mutagen
+except ImportError:
+    mutagen = None
+
+# Dependencia opcional para serializar el registro JSON más rápido
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configuración del registro: los mensajes se encolan ya formateados y un
+# hilo aparte (log_listener, iniciado en main) los escribe en disco
+log_queue = queue.Queue()
+log_listener = QueueListener(
+    log_queue,
+    RotatingFileHandler(
+        'conversion.log', maxBytes=5 * 1024 * 1024, backupCount=3, encoding='utf-8'
+    )
+)
 logging.basicConfig(
-    filename='conversion.log',
+    handlers=[QueueHandler(log_queue)],
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
@@ -29,64 +64,501 @@ SUPPORTED_FORMATS = [
     "mp3", "wav", "flac", "aac", "ogg", "m4a", "wma", "opus", "aiff", "alac"
 ]
 
+# Extensiones soportadas, listas para usar con str.endswith
+SUPPORTED_EXTENSIONS = tuple('.' + ext for ext in SUPPORTED_FORMATS)
+
+# Formatos cuya cabecera puede leer soundfile (el resto se lee con mutagen)
+SOUNDFILE_FORMATS = ("wav", "flac", "ogg", "aiff")
+
+# Formatos de salida que admiten carátula incrustada
+COVER_ART_FORMATS = ("mp3", "m4a", "flac")
+
+# Intervalo mínimo entre actualizaciones de progreso de un mismo proceso (ms)
+PROGRESS_INTERVAL_MS = 250
+
+# Intervalo de refresco del progreso y del registro en la interfaz (ms)
+UI_REFRESH_INTERVAL_MS = 100
+
+# Número máximo de mensajes de error pendientes de mostrar en el registro
+LOG_BUFFER_SIZE = 1000
+
+# Los archivos cortos se agrupan en una sola ejecución de ffmpeg para no
+# pagar el arranque del proceso por cada uno
+BATCH_MAX_DURATION = 60  # Duración máxima (s) de un archivo agrupable
+BATCH_SIZE = 8  # Archivos por ejecución de ffmpeg
+
+# Número máximo de ffprobe simultáneos al sondear archivos nuevos
+PROBE_CONCURRENCY = 8
+
+# Diferencia relativa de bitrate que se acepta para copiar el audio sin
+# recodificarlo cuando el archivo ya está en el formato de salida
+STREAM_COPY_TOLERANCE = 0.05
+
+# Claves de la salida -progress de ffmpeg que se utilizan (en bytes, sin decodificar)
+PROGRESS_KEYS = frozenset((b'out_time_us', b'out_time', b'progress'))
+
+# Archivo de registro de conversiones (una entrada JSON por línea)
+CONVERSION_LOG_PATH = "conversion_log.json"
+CONVERSION_LOG_BUFFER_SIZE = 1 << 16
+
+# Ruta de la caché de metadatos (duración y validez de cada archivo)
+METADATA_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".sonifylab", "meta.db")
+
+
+class MetadataCache:
+    """
+    Caché persistente en SQLite de los resultados de ffprobe.
+
+    Cada entrada se asocia a la ruta absoluta del archivo y se invalida
+    automáticamente cuando cambian su fecha de modificación o su tamaño.
+    Las escrituras se acumulan en memoria hasta llamar a flush().
+    """
+    def __init__(self, db_path=METADATA_CACHE_PATH):
+        self.pending = {}
+        try:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self.conn = sqlite3.connect(db_path)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                "path TEXT PRIMARY KEY, mtime REAL, size INTEGER, "
+                "duration REAL, valid INTEGER, bit_rate INTEGER)"
+            )
+            self.conn.commit()
+        except Exception as e:
+            logging.error(f"No se pudo abrir la caché de metadatos: {e}")
+            self.conn = None
+
+    def get(self, file_path):
+        """
+        Devuelve (duración, válido, bitrate) si la entrada sigue vigente, o
+        None. Cualquiera de los valores puede ser None si aún no se conoce.
+        """
+        if self.conn is None:
+            return None
+        path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        row = self.pending.get(path)
+        if row is None:
+            row = self.conn.execute(
+                "SELECT mtime, size, duration, valid, bit_rate FROM meta WHERE path = ?",
+                (path,)
+            ).fetchone()
+        if row is None or row[0] != stat.st_mtime or row[1] != stat.st_size:
+            return None
+        valid = None if row[3] is None else bool(row[3])
+        return row[2], valid, row[4]
+
+    def update(self, file_path, duration=None, valid=None, bit_rate=None):
+        """
+        Registra nuevos valores para un archivo, conservando los ya conocidos.
+        """
+        if self.conn is None:
+            return
+        path = os.path.abspath(file_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        cached = self.get(path)
+        if cached is not None:
+            if duration is None:
+                duration = cached[0]
+            if valid is None:
+                valid = cached[1]
+            if bit_rate is None:
+                bit_rate = cached[2]
+        self.pending[path] = (
+            stat.st_mtime, stat.st_size, duration,
+            None if valid is None else int(valid), bit_rate
+        )
+
+    def flush(self):
+        """
+        Escribe en disco todas las entradas pendientes en un único lote.
+        """
+        if self.conn is None or not self.pending:
+            return
+        try:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta "
+                "(path, mtime, size, duration, valid, bit_rate) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(path,) + row for path, row in self.pending.items()]
+            )
+            self.conn.commit()
+        except Exception as e:
+            logging.error(f"Error al escribir la caché de metadatos: {e}")
+        self.pending.clear()
+
+
+def scan_audio_files(root):
+    """
+    Recorre una carpeta y sus subcarpetas y devuelve las rutas de los
+    archivos con extensión soportada. Usa os.scandir, que informa del tipo
+    de cada entrada sin llamadas adicionales a stat. Como os.walk, no entra
+    en enlaces simbólicos a carpetas e ignora las carpetas ilegibles.
+    """
+    pending = deque([root])
+    while pending:
+        folder = pending.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif (entry.name.lower().endswith(SUPPORTED_EXTENSIONS)
+                          and entry.is_file()):
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def dumps_json(obj):
+    """
+    Serializa un objeto a JSON en bytes, con orjson si está disponible.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+async def probe_file(file_path, semaphore):
+    """
+    Ejecuta ffprobe sobre un archivo y devuelve (duración, válido, bitrate).
+    Los errores al lanzar ffprobe se propagan a gather_probes.
+    """
+    async with semaphore:
+        process = await asyncio.create_subprocess_exec(
+            'ffprobe', '-v', 'error', '-print_format', 'json',
+            '-show_format', '-show_streams', file_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await process.communicate()
+    try:
+        info = json.loads(stdout or b'{}')
+    except ValueError:
+        info = {}
+    audio_streams = [
+        stream for stream in info.get('streams', [])
+        if stream.get('codec_type') == 'audio'
+    ]
+    valid = bool(audio_streams)
+    try:
+        duration = float(info.get('format', {}).get('duration'))
+    except (TypeError, ValueError):
+        duration = None
+    # Se prefiere el bitrate del flujo de audio; el del contenedor incluye
+    # también carátulas y metadatos
+    bit_rate = None
+    for source in audio_streams[:1] + [info.get('format', {})]:
+        try:
+            bit_rate = int(source.get('bit_rate'))
+            break
+        except (TypeError, ValueError):
+            continue
+    return duration, valid, bit_rate
+
+
+async def gather_probes(file_paths):
+    semaphore = asyncio.Semaphore(PROBE_CONCURRENCY)
+    return await asyncio.gather(
+        *(probe_file(path, semaphore) for path in file_paths),
+        return_exceptions=True
+    )
+
+
+def cached_probes(file_paths, metadata_cache=None):
+    """
+    Separa los archivos cuyos datos ya están en la caché de los que hay que
+    sondear. Devuelve ({ruta: (duración, válido, bitrate)}, pendientes).
+    """
+    results = {}
+    pending = []
+    for path in file_paths:
+        cached = metadata_cache.get(path) if metadata_cache is not None else None
+        # Basta con conocer la validez y, si el archivo es válido, la
+        # duración y el bitrate
+        if cached is not None and cached[1] is not None and (
+                not cached[1] or None not in (cached[0], cached[2])):
+            results[path] = cached
+        else:
+            pending.append(path)
+    return results, pending
+
+
+def probe_files(file_paths):
+    """
+    Obtiene duración, validez y bitrate de varios archivos con una sola
+    ejecución de ffprobe por archivo, lanzadas de forma concurrente. Los que
+    no se han podido sondear así se validan uno a uno. No usa la caché, por
+    lo que puede llamarse desde un hilo de trabajo.
+    Devuelve {ruta: (duración, válido, bitrate)}; los archivos que no se han
+    podido validar no aparecen.
+    """
+    results = {}
+    if not file_paths:
+        return results
+    probes = asyncio.run(gather_probes(file_paths))
+    for path, probe in zip(file_paths, probes):
+        if isinstance(probe, BaseException):
+            logging.error(f"Error al validar el archivo {path}: {probe}")
+            # Sin ffprobe tampoco es posible validarlo uno a uno
+            if isinstance(probe, FileNotFoundError):
+                continue
+            valid = is_valid_file(path)
+            if valid is None:
+                continue
+            probe = (None, valid, None)
+        results[path] = probe
+    return results
+
+
+def store_probes(results, metadata_cache):
+    """
+    Guarda en la caché los resultados de probe_files.
+    """
+    for path, probe in results.items():
+        metadata_cache.update(
+            path, duration=probe[0], valid=probe[1], bit_rate=probe[2]
+        )
+
+
+def preflight_probe(file_paths, metadata_cache):
+    """
+    Sondea los archivos que no están en la caché y guarda el resultado.
+    Devuelve {ruta: (duración, válido, bitrate)}.
+    """
+    results, pending = cached_probes(file_paths, metadata_cache)
+    probes = probe_files(pending)
+    store_probes(probes, metadata_cache)
+    results.update(probes)
+    return results
+
+
+def is_valid_file(file_path):
+    """
+    Verifica con ffprobe si el archivo contiene audio. Devuelve None si no
+    se ha podido ejecutar ffprobe.
+    """
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_streams',
+             '-select_streams', 'a', file_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        return bool(result.stdout)
+    except Exception as e:
+        logging.error(f"Error al validar el archivo {file_path}: {e}")
+        return None
+
+
+def get_duration(file_path, metadata_cache=None):
+    """
+    Obtiene la duración de un archivo de audio en segundos.
+    """
+    if metadata_cache is not None:
+        cached = metadata_cache.get(file_path)
+        if cached is not None and cached[0] is not None:
+            return cached[0]
+    duration = read_header_duration(file_path)
+    if duration:
+        if metadata_cache is not None:
+            metadata_cache.update(file_path, duration=duration)
+        return duration
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+             '-of', 'default=noprint_wrappers=1:nokey=1', file_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        duration = float(result.stdout.strip())
+        if metadata_cache is not None:
+            metadata_cache.update(file_path, duration=duration)
+        return duration
+    except Exception as e:
+        logging.error(f"Error al obtener la duración del archivo: {e}")
+        return 0
+
+
+def read_header_duration(file_path):
+    """
+    Lee la duración directamente de la cabecera del archivo con soundfile
+    o mutagen, sin lanzar ffprobe. Devuelve None si no es posible.
+    """
+    extension = os.path.splitext(file_path)[1][1:].lower()
+    if extension in SOUNDFILE_FORMATS and soundfile is not None:
+        try:
+            return soundfile.info(file_path).duration
+        except Exception as e:
+            # Se intenta con mutagen antes de recurrir a ffprobe
+            logging.warning(f"soundfile no pudo leer la cabecera de {file_path}: {e}")
+    if mutagen is not None:
+        try:
+            audio = mutagen.File(file_path)
+            if audio is not None and audio.info.length:
+                return audio.info.length
+        except Exception as e:
+            logging.warning(f"No se pudo leer la cabecera de {file_path}: {e}")
+    return None
+
+
+@dataclass
+class ConversionJob:
+    """
+    Un archivo a convertir dentro de un proceso de ffmpeg.
+    """
+    index: int
+    input_file: str
+    output_file: str
+    duration: float = 0.0
+    bit_rate: int = None  # Bitrate de origen en bits/s, si se conoce
+
+    def __post_init__(self):
+        self.inv_duration = 1.0 / self.duration if self.duration else 0.0
+
 
 class ConversionProcess(QObject):
     """
-    Clase que maneja la conversión de un archivo utilizando QProcess.
+    Clase que maneja la conversión de uno o varios archivos utilizando un
+    único QProcess de ffmpeg (varias entradas y una salida por entrada).
     """
     progress_update = pyqtSignal(int, float)  # Índice, progreso (%)
     status_update = pyqtSignal(int, str)
     error_occurred = pyqtSignal(int, str)
     info_update = pyqtSignal(int, str)  # Información adicional
     finished = pyqtSignal(int, int)  # Índice, código de retorno
+    batch_failed = pyqtSignal(object)  # Proceso de un lote que ha fallado
 
-    def __init__(self, index, input_file, output_file, bitrate, format):
+    def __init__(self, jobs, bitrate, format, ffmpeg_path='ffmpeg'):
         super().__init__()
-        self.index = index
-        self.input_file = input_file
-        self.output_file = output_file
+        self.jobs = jobs
+        self.indices = [job.index for job in jobs]
         self.bitrate = bitrate
         self.format = format
         self.process = QProcess()
-        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        self.process.setProgram(ffmpeg_path)
         self.process.readyReadStandardOutput.connect(self.read_output)
         self.process.finished.connect(self.process_finished)
-        self.duration = self.get_duration()
         self.start_time = None
+        self.progress_block = {}
+        self.emit_timer = QElapsedTimer()
+        # La salida de errores va a un archivo temporal y solo se lee si falla
+        self.stderr_file = None
 
     def start(self):
         command = [
-            '-i', self.input_file,
-            '-b:a', self.bitrate,
-            '-progress', 'pipe:1',
-            '-y', self.output_file
+            '-nostats', '-loglevel', 'error',
+            '-progress', 'pipe:1', '-y'
         ]
-        self.process.start('ffmpeg', command)
-        self.status_update.emit(self.index, "En proceso")
-        self.start_time = datetime.now()
+        for job in self.jobs:
+            command += ['-i', job.input_file]
+        for position, job in enumerate(self.jobs):
+            # Cada salida toma la primera pista de audio, las etiquetas y los
+            # capítulos de su propia entrada, vaya o no en un lote
+            command += [
+                '-map', f'{position}:a:0',
+                '-map_metadata', str(position),
+                '-map_chapters', str(position)
+            ]
+            if self.format in COVER_ART_FORMATS:
+                # Conservar la carátula, si la hay, sin recodificarla
+                command += ['-map', f'{position}:v?', '-c:v', 'copy']
+            # Un hilo por codificador: el paralelismo lo dan los procesos simultáneos
+            command += ['-threads', '1']
+            if self.can_copy(job):
+                command += ['-c', 'copy', job.output_file]
+            else:
+                command += ['-b:a', self.bitrate, job.output_file]
+        self.stderr_file = QTemporaryFile()
+        if self.stderr_file.open():
+            self.process.setStandardErrorFile(self.stderr_file.fileName())
+        self.process.setArguments(command)
+        self.process.start()
+        for job in self.jobs:
+            self.status_update.emit(job.index, "En proceso")
+        self.start_time = time.monotonic()
+        self.emit_timer.start()
+
+    def can_copy(self, job):
+        """
+        Indica si el archivo ya está en el formato de salida con un bitrate
+        parecido al pedido, en cuyo caso basta con copiar el audio.
+        """
+        extension = os.path.splitext(job.input_file)[1][1:].lower()
+        if extension != self.format or not job.bit_rate:
+            return False
+        try:
+            target = int(self.bitrate.lower().rstrip('k')) * 1000
+        except ValueError:
+            return False
+        return abs(job.bit_rate - target) <= target * STREAM_COPY_TOLERANCE
 
     def read_output(self):
         while self.process.canReadLine():
-            line = self.process.readLine().data().decode().strip()
-            self.parse_progress(line)
+            self.parse_progress(self.process.readLine().data())
 
     def parse_progress(self, line):
-        if line.startswith('out_time='):
-            out_time_str = line.split('=')[1]
-            out_time = self.ffmpeg_time_to_seconds(out_time_str)
-            if self.duration > 0:
-                progress = (out_time / self.duration) * 100
-                self.progress_update.emit(self.index, progress)
-                # Calcular velocidad y tiempo restante
-                elapsed_time = (datetime.now() - self.start_time).total_seconds()
-                speed = out_time / elapsed_time if elapsed_time > 0 else 0
-                remaining_time = (self.duration - out_time) / speed if speed > 0 else 0
-                info = f"Velocidad: {speed:.2f}x, Restante: {self.format_time(remaining_time)}"
-                self.info_update.emit(self.index, info)
-        elif line.startswith('progress='):
-            if line.split('=')[1] == 'end':
-                self.progress_update.emit(self.index, 100)
-                self.info_update.emit(self.index, "Conversión completada")
+        """
+        Acumula las líneas clave=valor de ffmpeg hasta recibir la línea
+        progress=, que cierra cada bloque de progreso. Las líneas se tratan
+        como bytes (ffmpeg solo emite ASCII) y se descartan las claves que
+        no se utilizan.
+        """
+        sep = line.find(b'=')
+        if sep < 0:
+            return
+        key = line[:sep]
+        if key not in PROGRESS_KEYS:
+            return
+        self.progress_block[key] = line[sep + 1:].strip()
+        if key == b'progress':
+            self.handle_progress_block(self.progress_block)
+            self.progress_block = {}
+
+    def handle_progress_block(self, block):
+        if block.get(b'progress') == b'end':
+            for job in self.jobs:
+                self.progress_update.emit(job.index, 100)
+                self.info_update.emit(job.index, "Conversión completada")
+            return
+        # Limitar la frecuencia de actualización para no saturar la interfaz
+        if self.emit_timer.elapsed() < PROGRESS_INTERVAL_MS:
+            return
+        self.emit_timer.restart()
+        out_time = self.block_out_time(block)
+        # Calcular velocidad; todas las salidas de un lote avanzan a la vez
+        elapsed_time = time.monotonic() - self.start_time
+        speed = out_time / elapsed_time if elapsed_time > 0 else 0
+        for job in self.jobs:
+            if job.duration <= 0:
+                continue
+            progress = min(out_time * job.inv_duration * 100.0, 100.0)
+            self.progress_update.emit(job.index, progress)
+            remaining_time = max(job.duration - out_time, 0) / speed if speed > 0 else 0
+            info = f"Velocidad: {speed:.2f}x, Restante: {self.format_time(remaining_time)}"
+            self.info_update.emit(job.index, info)
+
+    def block_out_time(self, block):
+        """
+        Devuelve el tiempo procesado en segundos. Se usa el campo entero
+        out_time_us y solo si no está disponible se interpreta out_time.
+        """
+        out_time_us = block.get(b'out_time_us')
+        if out_time_us is not None:
+            try:
+                return int(out_time_us) * 1e-6
+            except ValueError:
+                pass
+        out_time = block.get(b'out_time', b'').decode('ascii', 'ignore')
+        return self.ffmpeg_time_to_seconds(out_time)
 
     def ffmpeg_time_to_seconds(self, time_str):
         try:
@@ -105,34 +577,187 @@ class ConversionProcess(QObject):
     def format_time(self, seconds):
         return str(timedelta(seconds=int(seconds)))
 
+    def read_error_output(self):
+        """
+        Devuelve la salida de errores de ffmpeg guardada en el archivo temporal.
+        """
+        if self.stderr_file is None:
+            return ""
+        return self.stderr_file.readAll().data().decode('utf-8', 'replace').strip()
+
     def process_finished(self):
         return_code = self.process.exitCode()
-        if return_code == 0:
-            self.status_update.emit(self.index, "Completado")
-            self.progress_update.emit(self.index, 100)
-        else:
-            self.status_update.emit(self.index, "Error")
-            error_message = self.process.readAllStandardError().data().decode('utf-8')
-            self.error_occurred.emit(self.index, error_message)
-        self.finished.emit(self.index, return_code)
+        error_message = self.read_error_output() if return_code != 0 else ""
+        # El archivo temporal se borra al liberarse
+        self.stderr_file = None
+        if return_code != 0 and len(self.jobs) > 1:
+            # Un solo archivo defectuoso hace fallar todo el lote; se delega
+            # en la ventana principal repetir cada archivo por separado
+            self.batch_failed.emit(self)
+            return
+        for job in self.jobs:
+            if return_code == 0:
+                self.status_update.emit(job.index, "Completado")
+                self.progress_update.emit(job.index, 100)
+            else:
+                self.status_update.emit(job.index, "Error")
+                self.error_occurred.emit(job.index, error_message)
+            self.finished.emit(job.index, return_code)
 
-    def get_duration(self):
-        """
-        Obtiene la duración del archivo de entrada en segundos.
-        """
+
+@dataclass
+class FileRow:
+    """
+    Datos mostrados en una fila de la tabla de archivos.
+    """
+    name: str
+    status: str = ""
+    progress: int = 0
+    info: str = ""
+
+
+class FileTableModel(QAbstractTableModel):
+    """
+    Modelo de la tabla de archivos. Cada actualización notifica solo la
+    celda modificada mediante dataChanged.
+    """
+    NAME, STATUS, PROGRESS, INFO = range(4)
+
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+        if column == self.NAME:
+            return row.name
+        if column == self.STATUS:
+            return row.status
+        if column == self.PROGRESS:
+            return row.progress
+        return row.info
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def add_row(self, name, status):
+        position = len(self.rows)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self.rows.append(FileRow(name, status))
+        self.endInsertRows()
+
+    def remove_row(self, position):
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self.rows[position]
+        self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.rows.clear()
+        self.endResetModel()
+
+    def set_status(self, position, status):
+        self.set_field(position, self.STATUS, 'status', status)
+
+    def set_progress(self, position, progress):
+        self.set_field(position, self.PROGRESS, 'progress', int(progress))
+
+    def set_info(self, position, info):
+        self.set_field(position, self.INFO, 'info', info)
+
+    def set_field(self, position, column, attribute, value):
+        row = self.rows[position]
+        if getattr(row, attribute) == value:
+            return
+        setattr(row, attribute, value)
+        index = self.index(position, column)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+
+class ProgressBarDelegate(QStyledItemDelegate):
+    """
+    Dibuja una barra de progreso en la celda sin crear un widget por fila.
+    """
+    def paint(self, painter, option, index):
+        progress = index.data() or 0
+        bar_option = QStyleOptionProgressBar()
+        bar_option.rect = option.rect
+        bar_option.state = option.state | QStyle.State_Horizontal
+        bar_option.minimum = 0
+        bar_option.maximum = 100
+        bar_option.progress = progress
+        bar_option.text = f"{progress}%"
+        bar_option.textVisible = True
+        QApplication.style().drawControl(QStyle.CE_ProgressBar, bar_option, painter)
+
+
+class LogWriterSignals(QObject):
+    """
+    Señales de ConversionLogWriter (QRunnable no puede emitir señales).
+    """
+    logged = pyqtSignal()
+
+
+class ConversionLogWriter(QRunnable):
+    """
+    Serializa y escribe una entrada del registro de conversiones fuera del
+    hilo de la interfaz.
+    """
+    def __init__(self, log_file, log_entry, signals):
+        super().__init__()
+        self.log_file = log_file
+        self.log_entry = log_entry
+        self.signals = signals
+
+    def run(self):
         try:
-            result = subprocess.run(
-                ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
-                 '-of', 'default=noprint_wrappers=1:nokey=1', self.input_file],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            duration = float(result.stdout.strip())
-            return duration
+            # La escritura en un archivo con búfer es segura entre hilos
+            self.log_file.write(dumps_json(self.log_entry) + b"\n")
         except Exception as e:
-            logging.error(f"Error al obtener la duración del archivo: {e}")
-            return 0
+            logging.error(f"Error al escribir el archivo de registro: {e}")
+        self.signals.logged.emit()
+
+
+class FileValidatorSignals(QObject):
+    """
+    Señales de FileValidator (QRunnable no puede emitir señales).
+    """
+    validated = pyqtSignal(object)  # FileValidator que ha terminado
+
+
+class FileValidator(QRunnable):
+    """
+    Sondea con ffprobe los archivos que se van a añadir fuera del hilo de la
+    interfaz. Los archivos ya presentes en la caché llegan resueltos en
+    results; el resultado se entrega mediante la señal validated.
+    """
+    def __init__(self, file_paths, results, pending, from_folder, signals):
+        super().__init__()
+        self.file_paths = file_paths
+        self.results = results
+        self.pending = pending
+        self.probes = {}
+        self.from_folder = from_folder
+        self.signals = signals
+
+    def run(self):
+        try:
+            self.probes = probe_files(self.pending)
+        except Exception as e:
+            logging.error(f"Error al validar los archivos: {e}")
+        self.signals.validated.emit(self)
 
 
 class MainWindow(QMainWindow):
@@ -156,6 +781,7 @@ class MainWindow(QMainWindow):
         self.setWindowIcon(QIcon(icon_path))
 
         self.files = []
+        self.files_set = set()  # Mismo contenido que self.files, para búsquedas rápidas
         self.output_folder = ''
         self.bitrate = '192k'
         self.format = 'mp3'
@@ -163,10 +789,39 @@ class MainWindow(QMainWindow):
         self.is_converting = False
         self.active_processes = []
         self.conversion_queue = []
-        self.max_concurrent_processes = max(1, os.cpu_count() - 1)
+        self.max_concurrent_processes = os.cpu_count() or 1
         self.total_files = 0
         self.completed_files = 0
         self.failed_files = []
+        self.metadata_cache = MetadataCache()
+        # Ruta de ffmpeg, resuelta una sola vez en lugar de en cada proceso
+        self.ffmpeg_path = shutil.which('ffmpeg')
+        # Progreso recibido pendiente de mostrar y progreso acumulado por archivo
+        self.pending_progress = {}
+        self.file_progress = {}
+        # Mensajes de error pendientes de mostrar en el registro
+        self.log_buffer = deque(maxlen=LOG_BUFFER_SIZE)
+        self.ui_timer = QTimer(self)
+        self.ui_timer.setInterval(UI_REFRESH_INTERVAL_MS)
+        self.ui_timer.timeout.connect(self.flush_ui)
+        # El registro de conversiones se mantiene abierto con un búfer amplio
+        # y se vuelca al cerrar la aplicación
+        try:
+            self.conversion_log = open(
+                CONVERSION_LOG_PATH, "ab", buffering=CONVERSION_LOG_BUFFER_SIZE
+            )
+        except OSError as e:
+            logging.error(f"No se pudo abrir el archivo de registro: {e}")
+            self.conversion_log = None
+        # Un solo hilo para el registro: las entradas se escriben en orden y
+        # al cerrar no hay que esperar a las validaciones del pool global
+        self.log_pool = QThreadPool(self)
+        self.log_pool.setMaxThreadCount(1)
+        self.log_writer_signals = LogWriterSignals()
+        self.log_writer_signals.logged.connect(self.conversion_logged)
+        self.validator_signals = FileValidatorSignals()
+        self.validator_signals.validated.connect(self.files_validated)
+        self.validations_running = 0
 
         self.init_ui()
 
@@ -197,9 +852,14 @@ class MainWindow(QMainWindow):
         files_label = QLabel(self.tr("Archivos de entrada:"))
         main_layout.addWidget(files_label)
 
-        self.files_table = QTableWidget(0, 4)
-        self.files_table.setHorizontalHeaderLabels(
-            [self.tr('Archivo'), self.tr('Estado'), self.tr('Progreso'), self.tr('Información')]
+        self.files_model = FileTableModel(
+            [self.tr('Archivo'), self.tr('Estado'), self.tr('Progreso'), self.tr('Información')],
+            self
+        )
+        self.files_table = QTableView()
+        self.files_table.setModel(self.files_model)
+        self.files_table.setItemDelegateForColumn(
+            FileTableModel.PROGRESS, ProgressBarDelegate(self.files_table)
         )
         self.files_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.files_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -249,6 +909,13 @@ class MainWindow(QMainWindow):
         config_layout.addWidget(format_label)
         config_layout.addWidget(self.format_combo)
 
+        processes_label = QLabel(self.tr("Procesos simultáneos:"))
+        self.processes_spin = QSpinBox()
+        self.processes_spin.setRange(1, max(64, self.max_concurrent_processes))
+        self.processes_spin.setValue(self.max_concurrent_processes)
+        config_layout.addWidget(processes_label)
+        config_layout.addWidget(self.processes_spin)
+
         main_layout.addLayout(config_layout)
 
         # Opciones adicionales
@@ -304,23 +971,11 @@ class MainWindow(QMainWindow):
             self.tr("Archivos de audio ({0})").format(' '.join(['*.' + ext for ext in SUPPORTED_FORMATS]))
         )
         if files:
-            for file in files:
-                if file not in self.files and self.is_valid_file(file):
-                    self.files.append(file)
-                    self.add_file_to_table(file)
+            new_files = [file for file in files if file not in self.files_set]
+            self.start_validation(new_files)
 
     def add_file_to_table(self, file_path):
-        row_position = self.files_table.rowCount()
-        self.files_table.insertRow(row_position)
-        file_item = QTableWidgetItem(os.path.basename(file_path))
-        status_item = QTableWidgetItem(self.tr("En espera"))
-        progress_bar = QProgressBar()
-        progress_bar.setValue(0)
-        info_item = QTableWidgetItem("")
-        self.files_table.setItem(row_position, 0, file_item)
-        self.files_table.setItem(row_position, 1, status_item)
-        self.files_table.setCellWidget(row_position, 2, progress_bar)
-        self.files_table.setItem(row_position, 3, info_item)
+        self.files_model.add_row(os.path.basename(file_path), self.tr("En espera"))
 
     def add_folder(self):
         """
@@ -328,25 +983,11 @@ class MainWindow(QMainWindow):
         """
         folder = QFileDialog.getExistingDirectory(self, self.tr("Selecciona carpeta"))
         if folder:
-            added_files = 0
-            for root, dirs, files in os.walk(folder):
-                for file in files:
-                    if file.lower().endswith(tuple(SUPPORTED_FORMATS)):
-                        full_path = os.path.join(root, file)
-                        if full_path not in self.files and self.is_valid_file(full_path):
-                            self.files.append(full_path)
-                            self.add_file_to_table(full_path)
-                            added_files += 1
-            if added_files > 0:
-                QMessageBox.information(
-                    self, self.tr("Información"),
-                    self.tr("Se añadieron {0} archivos desde la carpeta seleccionada.").format(added_files)
-                )
-            else:
-                QMessageBox.information(
-                    self, self.tr("Información"),
-                    self.tr("No se encontraron archivos de audio en la carpeta seleccionada.")
-                )
+            candidates = [
+                path for path in scan_audio_files(folder)
+                if path not in self.files_set
+            ]
+            self.start_validation(candidates, from_folder=True)
 
     def remove_files(self):
         """
@@ -354,15 +995,16 @@ class MainWindow(QMainWindow):
         """
         selected_rows = self.files_table.selectionModel().selectedRows()
         for row in sorted(selected_rows, key=lambda x: x.row(), reverse=True):
-            self.files.pop(row.row())
-            self.files_table.removeRow(row.row())
+            self.files_set.discard(self.files.pop(row.row()))
+            self.files_model.remove_row(row.row())
 
     def clear_files(self):
         """
         Limpia la lista de archivos.
         """
         self.files.clear()
-        self.files_table.setRowCount(0)
+        self.files_set.clear()
+        self.files_model.clear()
 
     def browse_output_folder(self):
         """
@@ -375,26 +1017,66 @@ class MainWindow(QMainWindow):
             self.output_folder = folder
             self.output_line_edit.setText(folder)
 
-    def is_valid_file(self, file_path):
+    def start_validation(self, file_paths, from_folder=False):
         """
-        Verifica si el archivo es válido utilizando ffprobe.
+        Valida los archivos en el QThreadPool global para no bloquear la
+        interfaz; las filas se añaden en files_validated.
         """
-        try:
-            result = subprocess.run(
-                ['ffprobe', '-v', 'error', '-show_streams',
-                 '-select_streams', 'a', file_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            if result.stdout:
-                return True
+        if not file_paths and not from_folder:
+            return
+        results, pending = cached_probes(file_paths, self.metadata_cache)
+        self.validations_running += 1
+        self.set_validating(True)
+        QThreadPool.globalInstance().start(
+            FileValidator(file_paths, results, pending, from_folder, self.validator_signals)
+        )
+
+    @pyqtSlot(object)
+    def files_validated(self, validator):
+        """
+        Añade a la lista los archivos válidos de una validación terminada.
+        """
+        store_probes(validator.probes, self.metadata_cache)
+        self.metadata_cache.flush()
+        validator.results.update(validator.probes)
+        added_files = 0
+        for path in validator.file_paths:
+            probe = validator.results.get(path)
+            if probe is None or path in self.files_set:
+                continue
+            if not probe[1]:
+                if path in validator.probes:
+                    logging.warning(f"El archivo {path} no es válido o está corrupto.")
+                continue
+            self.files.append(path)
+            self.files_set.add(path)
+            self.add_file_to_table(path)
+            added_files += 1
+        self.validations_running -= 1
+        if not self.validations_running:
+            self.set_validating(False)
+        if validator.from_folder:
+            if added_files > 0:
+                QMessageBox.information(
+                    self, self.tr("Información"),
+                    self.tr("Se añadieron {0} archivos desde la carpeta seleccionada.").format(added_files)
+                )
             else:
-                logging.warning(f"El archivo {file_path} no es válido o está corrupto.")
-                return False
-        except Exception as e:
-            logging.error(f"Error al validar el archivo {file_path}: {e}")
-            return False
+                QMessageBox.information(
+                    self, self.tr("Información"),
+                    self.tr("No se encontraron archivos de audio en la carpeta seleccionada.")
+                )
+
+    def set_validating(self, validating):
+        """
+        Indica en la barra de estado que hay archivos validándose e impide
+        iniciar la conversión mientras tanto.
+        """
+        if validating:
+            self.statusBar().showMessage(self.tr("Validando archivos..."))
+        else:
+            self.statusBar().clearMessage()
+        self.convert_btn.setEnabled(not validating and not self.is_converting)
 
     def start_conversion(self):
         """
@@ -415,11 +1097,19 @@ class MainWindow(QMainWindow):
         self.failed_files = []
         self.completed_files = 0
         self.total_files = len(self.files)
+        self.max_concurrent_processes = self.processes_spin.value()
         self.active_processes = []
         self.conversion_queue = []
+        self.pending_progress.clear()
+        self.file_progress.clear()
         self.overall_progress_bar.setValue(0)
         self.log_text_edit.clear()
+        self.log_buffer.clear()
+        self.ui_timer.start()
 
+        # Sondear de una vez los archivos cuya duración no está en la caché
+        probes = preflight_probe(self.files, self.metadata_cache)
+        batch = []
         for index, input_file in enumerate(self.files):
             output_file = os.path.join(
                 self.output_folder,
@@ -430,16 +1120,58 @@ class MainWindow(QMainWindow):
                 self.update_status(index, self.tr("Omitido"))
                 self.update_progress(index, 100)
                 continue
-            process = ConversionProcess(
-                index, input_file, output_file, self.bitrate_combo.currentText(),
-                self.format_combo.currentText()
-            )
-            process.status_update.connect(self.update_status)
-            process.error_occurred.connect(self.handle_error)
-            process.progress_update.connect(self.update_progress)
-            process.info_update.connect(self.update_info)
-            process.finished.connect(self.process_finished)
+            duration, _, bit_rate = probes.get(input_file, (None, None, None))
+            if duration is None:
+                duration = get_duration(input_file, self.metadata_cache)
+            job = ConversionJob(index, input_file, output_file, duration, bit_rate)
+            if 0 < job.duration <= BATCH_MAX_DURATION:
+                batch.append(job)
+                if len(batch) == BATCH_SIZE:
+                    self.queue_conversion(batch)
+                    batch = []
+            else:
+                self.queue_conversion([job])
+        if batch:
+            self.queue_conversion(batch)
+        self.metadata_cache.flush()
+        self.start_next_processes()
+
+    def queue_conversion(self, jobs, first=False):
+        """
+        Crea un proceso de conversión para los trabajos indicados y lo añade
+        a la cola (al principio si first es True).
+        """
+        process = ConversionProcess(
+            jobs, self.bitrate_combo.currentText(), self.format_combo.currentText(),
+            self.ffmpeg_path
+        )
+        process.status_update.connect(self.update_status)
+        process.error_occurred.connect(self.handle_error)
+        process.progress_update.connect(self.update_progress)
+        process.info_update.connect(self.update_info)
+        process.finished.connect(self.process_finished)
+        process.batch_failed.connect(self.retry_batch)
+        if first:
+            self.conversion_queue.insert(0, process)
+        else:
             self.conversion_queue.append(process)
+
+    @pyqtSlot(object)
+    def retry_batch(self, process):
+        """
+        Repite por separado cada archivo de un lote que ha fallado, para que
+        el error se atribuya solo al archivo que lo produce.
+        """
+        if process in self.active_processes:
+            self.active_processes.remove(process)
+        if not self.is_converting:
+            # El lote se ha detenido a petición del usuario
+            for job in process.jobs:
+                self.update_status(job.index, self.tr("Error"))
+            return
+        for job in reversed(process.jobs):
+            self.update_progress(job.index, 0)
+            self.queue_conversion([job], first=True)
         self.start_next_processes()
 
     def start_next_processes(self):
@@ -487,37 +1219,62 @@ class MainWindow(QMainWindow):
         """
         Verifica si ffmpeg está instalado y accesible.
         """
-        try:
-            subprocess.run(
-                ['ffmpeg', '-version'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            return True
-        except FileNotFoundError:
-            return False
+        if self.ffmpeg_path is None:
+            # Puede haberse instalado después de abrir la aplicación
+            self.ffmpeg_path = shutil.which('ffmpeg')
+        return self.ffmpeg_path is not None
 
     @pyqtSlot(int, str)
     def update_status(self, index, status):
         """
         Actualiza el estado de un archivo en la tabla.
         """
-        self.files_table.item(index, 1).setText(status)
+        self.files_model.set_status(index, status)
 
     @pyqtSlot(int, str)
     def update_info(self, index, info):
         """
         Actualiza la información adicional (velocidad, tiempo restante).
         """
-        self.files_table.item(index, 3).setText(info)
+        self.files_model.set_info(index, info)
 
     @pyqtSlot(int, float)
     def update_progress(self, index, progress):
         """
-        Actualiza la barra de progreso individual de un archivo.
+        Registra el progreso de un archivo; la tabla y la barra general se
+        actualizan periódicamente en flush_progress.
+        """
+        self.pending_progress[index] = progress
+
+    def flush_progress(self):
+        """
+        Aplica el progreso pendiente a la tabla y recalcula la barra general.
+        """
+        for index, progress in self.pending_progress.items():
+            self.files_model.set_progress(index, progress)
+            if progress > self.file_progress.get(index, 0):
+                self.file_progress[index] = progress
+        self.pending_progress.clear()
+        if self.total_files:
+            overall = sum(self.file_progress.values()) / self.total_files
+            self.overall_progress_bar.setValue(int(overall))
+
+    def flush_log(self):
+        """
+        Muestra en el registro de la interfaz los mensajes acumulados.
+        """
+        if not self.log_buffer:
+            return
+        self.log_text_edit.append('\n'.join(self.log_buffer))
+        self.log_text_edit.ensureCursorVisible()
+        self.log_buffer.clear()
+
+    def flush_ui(self):
+        """
+        Refresca el progreso y el registro; se llama desde ui_timer.
         """
-        progress_bar = self.files_table.cellWidget(index, 2)
-        progress_bar.setValue(int(progress))
+        self.flush_progress()
+        self.flush_log()
 
     @pyqtSlot(int, str)
     def handle_error(self, index, error_message):
@@ -525,8 +1282,9 @@ class MainWindow(QMainWindow):
         Maneja errores ocurridos durante la conversión.
         """
         logging.error(error_message)
-        self.log_text_edit.append(f"ERROR: {error_message}")
-        self.log_text_edit.ensureCursorVisible()
+        self.log_buffer.append(f"ERROR: {error_message}")
+        if not self.ui_timer.isActive():
+            self.flush_log()
         self.failed_files.append(self.files[index])
         self.update_status(index, self.tr("Error"))
 
@@ -536,16 +1294,19 @@ class MainWindow(QMainWindow):
         Maneja la finalización de un proceso de conversión.
         """
         self.completed_files += 1
-        progress = int((self.completed_files / self.total_files) * 100)
-        self.overall_progress_bar.setValue(progress)
+        # Un archivo terminado cuenta como completo en la barra general,
+        # aunque haya fallado
+        self.file_progress[index] = 100
         # Remover el proceso de la lista activa
         for p in self.active_processes:
-            if p.index == index:
+            if index in p.indices:
                 self.active_processes.remove(p)
                 break
         # Iniciar el siguiente proceso si hay alguno en cola
         self.start_next_processes()
         if self.completed_files == self.total_files:
+            self.ui_timer.stop()
+            self.flush_ui()
             self.is_converting = False
             self.set_interface_enabled(True)
             self.convert_btn.setEnabled(True)
@@ -575,6 +1336,8 @@ class MainWindow(QMainWindow):
             if process.process.state() != QProcess.NotRunning:
                 process.process.kill()
         self.conversion_queue.clear()
+        self.ui_timer.stop()
+        self.flush_ui()
         self.is_converting = False
         self.set_interface_enabled(True)
         self.convert_btn.setEnabled(True)
@@ -591,6 +1354,7 @@ class MainWindow(QMainWindow):
         self.output_line_edit.setEnabled(enabled)
         self.bitrate_combo.setEnabled(enabled)
         self.format_combo.setEnabled(enabled)
+        self.processes_spin.setEnabled(enabled)
         self.overwrite_checkbox.setEnabled(enabled)
         self.add_files_btn.setEnabled(enabled)
         self.remove_files_btn.setEnabled(enabled)
@@ -598,21 +1362,27 @@ class MainWindow(QMainWindow):
 
     def log_conversion(self):
         """
-        Registra la conversión en un archivo JSON.
+        Registra la conversión en un archivo JSON. La serialización y la
+        escritura se hacen en el QThreadPool del registro.
         """
         log_entry = {
             "timestamp": datetime.now().isoformat(),
-            "input_files": self.files,
+            "input_files": list(self.files),
             "output_folder": self.output_folder,
             "output_format": self.format_combo.currentText()
         }
-        try:
-            with open("conversion_log.json", "a") as log_file:
-                json.dump(log_entry, log_file)
-                log_file.write("\n")
-        except Exception as e:
-            logging.error(f"Error al escribir el archivo de registro: {e}")
+        if self.conversion_log is None:
+            self.conversion_logged()
+            return
+        self.log_pool.start(
+            ConversionLogWriter(self.conversion_log, log_entry, self.log_writer_signals)
+        )
 
+    @pyqtSlot()
+    def conversion_logged(self):
+        """
+        Informa en el registro de la interfaz de que la conversión ha terminado.
+        """
         self.log_text_edit.append(self.tr("Conversión completada."))
 
     def show_about(self):
@@ -637,12 +1407,27 @@ class MainWindow(QMainWindow):
             )
             if result == QMessageBox.Yes:
                 self.stop_conversion()
+                self.close_conversion_log()
                 event.accept()
             else:
                 event.ignore()
         else:
+            self.close_conversion_log()
             event.accept()
 
+    def close_conversion_log(self):
+        """
+        Vuelca y cierra el archivo de registro de conversiones.
+        """
+        if self.conversion_log is not None:
+            # Esperar a que terminen las escrituras pendientes
+            self.log_pool.waitForDone()
+            try:
+                self.conversion_log.close()
+            except OSError as e:
+                logging.error(f"Error al escribir el archivo de registro: {e}")
+            self.conversion_log = None
+
 
 def main():
     app = QApplication(sys.argv)
@@ -654,9 +1439,12 @@ def main():
     # translator.load("app_" + locale)  # Por ejemplo: app_es.qm
     # app.installTranslator(translator)
 
+    log_listener.start()
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    log_listener.stop()
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':